@@ -0,0 +1,181 @@
+"""Consultas sobre los casos de suicidio reportados en Antioquia.
+
+Reúne la misma lógica de filtros que las páginas de Streamlit para poder
+usarla desde otros scripts o desde la línea de comandos, sin la interfaz:
+
+    from consultas import consultar
+    consultar(años=(2010, 2020), regiones=["VALLE DE ABURRA"], top_n=10)
+
+    python consultas.py --desde 2010 --hasta 2020 --top 10 --salida top.csv
+    python consultas.py --por-region --directorio reportes --procesos 4
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "datasets",
+                          "Cantidad_anual_de_suicidios_reportados.xls")
+
+
+@lru_cache(maxsize=1)
+def cargar_datos():
+    """Lee el dataset una sola vez por proceso."""
+    return pd.read_excel(RUTA_DATOS)
+
+
+@lru_cache(maxsize=1)
+def casos_por_municipio_y_año():
+    """Agregado base (región, municipio, año) sobre el que se calculan los reportes."""
+    return cargar_datos().groupby(["NombreRegion", "NombreMunicipio", "Año"], as_index=False)["NumeroCasos"].sum()
+
+
+def comparar_con_promedio(df, año):
+    """Casos de cada municipio en `año` frente a su promedio anual histórico."""
+    promedio_general = df.groupby("NombreMunicipio")["NumeroCasos"].mean().reset_index()
+    promedio_general.columns = ["NombreMunicipio", "PromedioGeneral"]
+    df_comparado = df[df["Año"] == año].merge(promedio_general, on="NombreMunicipio")
+    df_comparado["Diferencia"] = df_comparado["NumeroCasos"] - df_comparado["PromedioGeneral"]
+    return df_comparado
+
+
+def filtrar(df, años=None, regiones=None, municipios=None, casos=None,
+            min_casos_acumulados=None, comparar_promedio=None, año_comparacion=None):
+    """Aplica los filtros de las páginas de análisis. `None` significa sin filtro.
+
+    `min_casos_acumulados` deja los municipios con al menos esos casos sumando todos los años,
+    y `comparar_promedio` ("mayor" o "menor") los que en `año_comparacion` (por defecto el
+    último año) estuvieron por encima o por debajo de su promedio histórico. Ambos se
+    calculan sobre `df` completo, como en la página de análisis avanzado.
+    """
+    if comparar_promedio not in (None, "mayor", "menor"):
+        raise ValueError(f'comparar_promedio debe ser "mayor" o "menor", no {comparar_promedio!r}')
+    mascara = pd.Series(True, index=df.index)
+    if min_casos_acumulados is not None:
+        df_acumulado = df.groupby("NombreMunicipio")["NumeroCasos"].sum()
+        mascara &= df["NombreMunicipio"].isin(df_acumulado[df_acumulado >= min_casos_acumulados].index)
+    if comparar_promedio is not None:
+        df_comparado = comparar_con_promedio(df, año_comparacion if año_comparacion is not None else df["Año"].max())
+        cond = df_comparado["Diferencia"] > 0 if comparar_promedio == "mayor" else df_comparado["Diferencia"] < 0
+        mascara &= df["NombreMunicipio"].isin(df_comparado[cond]["NombreMunicipio"])
+    if años is not None:
+        mascara &= (df["Año"] >= años[0]) & (df["Año"] <= años[1])
+    if regiones is not None:
+        mascara &= df["NombreRegion"].isin(regiones)
+    if municipios is not None:
+        mascara &= df["NombreMunicipio"].isin(municipios)
+    if casos is not None:
+        mascara &= (df["NumeroCasos"] >= casos[0]) & (df["NumeroCasos"] <= casos[1])
+    return df[mascara]
+
+
+def agrupar_por_municipio(df_filtrado, top_n=0):
+    """Total de casos por municipio; si `top_n` > 0 deja solo los municipios con más casos."""
+    df_agrupado = df_filtrado.groupby("NombreMunicipio", as_index=False)["NumeroCasos"].sum()
+    if top_n > 0:
+        df_agrupado = df_agrupado.sort_values("NumeroCasos", ascending=False).head(top_n)
+    return df_agrupado
+
+
+def consultar(años=None, regiones=None, municipios=None, casos=None, top_n=0,
+              min_casos_acumulados=None, comparar_promedio=None, año_comparacion=None):
+    """Total de casos por municipio con los filtros dados, sobre el agregado en caché."""
+    df_filtrado = filtrar(casos_por_municipio_y_año(), años, regiones, municipios, casos,
+                          min_casos_acumulados, comparar_promedio, año_comparacion)
+    return agrupar_por_municipio(df_filtrado, top_n)
+
+
+def resumen(df_filtrado):
+    """Indicadores generales de los datos filtrados, o `None` si no hay datos."""
+    if df_filtrado.empty:
+        return None
+    resumen_agrupado = df_filtrado.groupby("NombreMunicipio")["NumeroCasos"].sum().reset_index()
+    municipio_max = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmax()]
+    municipio_min = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmin()]
+    return {
+        "total_casos": int(df_filtrado["NumeroCasos"].sum()),
+        "total_municipios": df_filtrado["NombreMunicipio"].nunique(),
+        "años_analizados": df_filtrado["Año"].nunique(),
+        "año_inicio": df_filtrado["Año"].min(),
+        "año_fin": df_filtrado["Año"].max(),
+        "municipio_max": (municipio_max["NombreMunicipio"], int(municipio_max["NumeroCasos"])),
+        "municipio_min": (municipio_min["NombreMunicipio"], int(municipio_min["NumeroCasos"])),
+        "promedio_municipio": resumen_agrupado["NumeroCasos"].mean(),
+        "mediana_municipio": resumen_agrupado["NumeroCasos"].median(),
+    }
+
+
+def exportar(df, ruta):
+    """Guarda el resultado como CSV o Excel según la extensión de `ruta`."""
+    if ruta.endswith(".xlsx"):
+        df.to_excel(ruta, index=False, sheet_name="Datos", engine="xlsxwriter")
+    else:
+        df.to_csv(ruta, index=False)
+
+
+def _reporte_region(region, directorio, extension, **filtros):
+    df_region = consultar(regiones=[region], **filtros)
+    ruta = os.path.join(directorio, f"{region.replace('/', '-')}.{extension}")
+    exportar(df_region, ruta)
+    return ruta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reportes de casos de suicidio en Antioquia.")
+    parser.add_argument("--desde", type=int, help="Primer año (incluido)")
+    parser.add_argument("--hasta", type=int, help="Último año (incluido)")
+    parser.add_argument("--region", action="append", dest="regiones", help="Región; se puede repetir")
+    parser.add_argument("--municipio", action="append", dest="municipios", help="Municipio; se puede repetir")
+    parser.add_argument("--min-casos", type=int, help="Mínimo de casos por registro")
+    parser.add_argument("--max-casos", type=int, help="Máximo de casos por registro")
+    parser.add_argument("--top", type=int, default=0, help="Solo los N municipios con más casos")
+    parser.add_argument("--min-casos-acumulados", type=int, help="Municipios con al menos N casos en total")
+    parser.add_argument("--comparar-promedio", choices=["mayor", "menor"],
+                        help="Municipios por encima o por debajo de su promedio en --año-comparacion")
+    parser.add_argument("--año-comparacion", type=int, help="Año a comparar con el promedio; por defecto el último")
+    parser.add_argument("--salida", help="Archivo .csv o .xlsx; por defecto se imprime en pantalla")
+    parser.add_argument("--por-region", action="store_true", help="Un reporte por región en --directorio")
+    parser.add_argument("--directorio", default="reportes", help="Carpeta de los reportes por región")
+    parser.add_argument("--formato", choices=["csv", "xlsx"], default="csv", help="Formato de los reportes por región")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo para --por-region")
+    args = parser.parse_args(argv)
+
+    datos = casos_por_municipio_y_año()
+    años = None
+    if args.desde is not None or args.hasta is not None:
+        años = (args.desde if args.desde is not None else datos["Año"].min(),
+                args.hasta if args.hasta is not None else datos["Año"].max())
+    casos = None
+    if args.min_casos is not None or args.max_casos is not None:
+        casos = (args.min_casos if args.min_casos is not None else datos["NumeroCasos"].min(),
+                 args.max_casos if args.max_casos is not None else datos["NumeroCasos"].max())
+
+    filtros = dict(años=años, municipios=args.municipios, casos=casos, top_n=args.top,
+                   min_casos_acumulados=args.min_casos_acumulados, comparar_promedio=args.comparar_promedio,
+                   año_comparacion=args.año_comparacion)
+
+    if args.por_region:
+        # Sin --region, una región por cada una de las que tienen municipios seleccionados
+        datos_seleccion = filtrar(datos, municipios=args.municipios)
+        regiones = args.regiones or sorted(datos_seleccion["NombreRegion"].dropna().unique())
+        os.makedirs(args.directorio, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=args.procesos) as executor:
+            futuros = [
+                executor.submit(_reporte_region, region, args.directorio, args.formato, **filtros)
+                for region in regiones
+            ]
+            for futuro in futuros:
+                print(futuro.result())
+        return
+
+    df_resultado = consultar(regiones=args.regiones, **filtros)
+    if args.salida:
+        exportar(df_resultado, args.salida)
+    else:
+        print(df_resultado.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from consultas import cargar_datos, filtrar, agrupar_por_municipio, resumen
 
 st.title("Tasa de Suicidios en Antioquia")
 
 # Cargar datos
 @st.cache_data
 def load_data():
-    return pd.read_excel("static/datasets/Cantidad_anual_de_suicidios_reportados.xls")
+    return cargar_datos()
 
 df = load_data()
 
@@ -40,30 +41,61 @@ rango_casos = st.sidebar.slider("Número de casos", min_casos, max_casos, (min_c
 # Filtro opcional: Municipios con mayor número de casos
 top_n = st.sidebar.number_input("Escribe un número para mostrar los municipios con mayor  cantidad de casos", min_value=0, max_value=100, value=0)
 
+# Opciones de rendimiento para gráficos con muchos municipios
+with st.sidebar.expander("⚙️ Rendimiento de gráficos"):
+    umbral_municipios = st.number_input(
+        "Máximo de municipios a graficar individualmente (si se supera, se agrupa por región)",
+        min_value=1, max_value=200, value=25
+    )
+    max_puntos_serie = st.number_input("Máximo de puntos por serie", min_value=10, max_value=1000, value=200)
+
+# A partir de este número de puntos se usan trazas WebGL (Scattergl) en lugar de SVG
+UMBRAL_PUNTOS_WEBGL = 1000
+
 # Aplicar filtros
-df_filtrado = df[
-    (df["Año"] >= rango_años[0]) &
-    (df["Año"] <= rango_años[1]) &
-    (df["NombreRegion"].isin(region_seleccionada)) &
-    (df["NombreMunicipio"].isin(municipios_seleccionados)) &
-    (df["NumeroCasos"] >= rango_casos[0]) &
-    (df["NumeroCasos"] <= rango_casos[1])
-]
-
-# Agrupar por municipio si se seleccionan varios años
-df_agrupado = df_filtrado.groupby("NombreMunicipio", as_index=False)["NumeroCasos"].sum()
-
-# Aplicar filtro de Top N si es necesario
-if top_n > 0:
-    df_agrupado = df_agrupado.sort_values("NumeroCasos", ascending=False).head(top_n)
+df_filtrado = filtrar(df, rango_años, region_seleccionada, municipios_seleccionados, rango_casos)
+
+# Agrupar por municipio si se seleccionan varios años, con filtro de Top N si es necesario
+df_agrupado = agrupar_por_municipio(df_filtrado, top_n)
+
+# Filtrar sin agrupar (para ver año a año); no aplica el filtro de casos ni el Top N
+df_interanual = filtrar(df, rango_años, region_seleccionada, municipios_seleccionados).copy()
+
+# Región de cada municipio, para agrupar y hacer drill-down
+region_por_municipio = df_interanual.drop_duplicates("NombreMunicipio").set_index("NombreMunicipio")["NombreRegion"]
+
+# Si hay demasiados municipios en un gráfico se grafica por región, con opción de ver el detalle de una región
+agrupar_barras = len(df_agrupado) > umbral_municipios
+agrupar_lineas = df_interanual["NombreMunicipio"].nunique() > umbral_municipios
+region_detalle = "Todas las regiones"
+if agrupar_barras or agrupar_lineas:
+    regiones_graficadas = sorted(df_interanual["NombreRegion"].dropna().unique())
+    st.caption(
+        f"Hay más de {umbral_municipios} municipios seleccionados: los gráficos se agrupan por región. "
+        "Selecciona una región para ver sus municipios."
+    )
+    region_detalle = st.selectbox("🔎 Ver detalle de una región", ["Todas las regiones"] + regiones_graficadas)
+    if region_detalle != "Todas las regiones":
+        agrupar_barras = agrupar_lineas = False
+
+if agrupar_barras:
+    df_barras = df_agrupado.assign(NombreRegion=df_agrupado["NombreMunicipio"].map(region_por_municipio))
+    df_barras = df_barras.groupby("NombreRegion", as_index=False)["NumeroCasos"].sum()
+    eje_barras = "NombreRegion"
+elif region_detalle != "Todas las regiones":
+    df_barras = df_agrupado[df_agrupado["NombreMunicipio"].map(region_por_municipio) == region_detalle]
+    eje_barras = "NombreMunicipio"
+else:
+    df_barras = df_agrupado
+    eje_barras = "NombreMunicipio"
 
 # Mostrar gráfico
-if not df_agrupado.empty:
+if not df_barras.empty:
     fig = px.bar(
-        df_agrupado,
-        x="NombreMunicipio",
+        df_barras,
+        x=eje_barras,
         y="NumeroCasos",
-        title=f"Casos de Suicidio por Municipio ({rango_años[0]} - {rango_años[1]})",
+        title=f"Casos de Suicidio por {'Región' if agrupar_barras else 'Municipio'} ({rango_años[0]} - {rango_años[1]})",
         labels={"NumeroCasos": "Número de Casos"},
         height=500
     )
@@ -74,14 +106,6 @@ else:
 
 st.subheader("📈 Variación Interanual de Casos por Municipio")
 
-# Filtrar sin agrupar (para ver año a año)
-df_interanual = df[
-    (df["NombreRegion"].isin(region_seleccionada)) &
-    (df["NombreMunicipio"].isin(municipios_seleccionados)) &
-    (df["Año"] >= rango_años[0]) &
-    (df["Año"] <= rango_años[1])
-].copy()
-
 # Ordenar y calcular variación por municipio
 df_interanual.sort_values(["NombreMunicipio", "Año"], inplace=True)
 df_interanual["Variacion"] = df_interanual.groupby("NombreMunicipio")["NumeroCasos"].pct_change() * 100
@@ -105,14 +129,36 @@ st.dataframe(df_mostrar, use_container_width=True)
 
 st.subheader("📊 Evolución Temporal de Casos")
 
+# Serie por región o por municipio según el número de municipios seleccionados
+if agrupar_lineas:
+    df_linea = df_interanual.groupby(["NombreRegion", "Año"], as_index=False)["NumeroCasos"].sum()
+    serie = "NombreRegion"
+    titulo_linea = "Evolución de Casos por Región"
+else:
+    df_linea = df_interanual
+    if region_detalle != "Todas las regiones":
+        df_linea = df_linea[df_linea["NombreRegion"] == region_detalle]
+    serie = "NombreMunicipio"
+    titulo_linea = "Evolución de Casos por Municipio"
+
+# Limitar los puntos por serie a `max_puntos_serie` años espaciados uniformemente,
+# conservando siempre el primero y el último
+posicion = df_linea.groupby(serie).cumcount()
+total = df_linea.groupby(serie)["Año"].transform("size")
+escala = (total - 1) / (max_puntos_serie - 1)
+df_linea = df_linea[(total <= max_puntos_serie) | ((posicion / escala).round() * escala).round().eq(posicion)]
+
+render_mode = "webgl" if len(df_linea) > UMBRAL_PUNTOS_WEBGL else "svg"
+
 fig_line = px.line(
-    df_interanual,
+    df_linea,
     x="Año",
     y="NumeroCasos",
-    color="NombreMunicipio",
+    color=serie,
     markers=True,
-    title="Evolución de Casos por Municipio",
+    title=titulo_linea,
     labels={"NumeroCasos": "Número de Casos"},
+    render_mode=render_mode,
     height=500
 )
 
@@ -124,13 +170,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 fig_line = px.line(
-    df_interanual,
+    df_linea,
     x="Año",
     y="NumeroCasos",
-    color="NombreMunicipio",
+    color=serie,
     markers=True,
-    title="Evolución de Casos por Municipio",
+    title=titulo_linea,
     labels={"NumeroCasos": "Número de Casos"},
+    render_mode=render_mode,
     height=500
 )
 st.plotly_chart(fig_line)
@@ -141,27 +188,20 @@ st.subheader("🧾 Resumen General de Datos Filtrados")
 if df_filtrado.empty:
     st.info("No hay datos disponibles para mostrar un resumen con los filtros aplicados.")
 else:
-    total_casos = df_filtrado["NumeroCasos"].sum()
-    total_municipios = df_filtrado["NombreMunicipio"].nunique()
-    años_analizados = df_filtrado["Año"].nunique()
-    año_inicio = df_filtrado["Año"].min()
-    año_fin = df_filtrado["Año"].max()
-
-    resumen_agrupado = df_filtrado.groupby("NombreMunicipio")["NumeroCasos"].sum().reset_index()
-    municipio_max = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmax()]
-    municipio_min = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmin()]
-    promedio_municipio = resumen_agrupado["NumeroCasos"].mean()
+    datos_resumen = resumen(df_filtrado)
+    municipio_max, casos_max = datos_resumen["municipio_max"]
+    municipio_min, casos_min = datos_resumen["municipio_min"]
 
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("🔢 Total de casos reportados", f"{int(total_casos):,}")
-        st.metric("🏘️ Municipios analizados", total_municipios)
-        st.metric("📅 Años cubiertos", f"{año_inicio} - {año_fin} ({años_analizados} años)")
+        st.metric("🔢 Total de casos reportados", f"{datos_resumen['total_casos']:,}")
+        st.metric("🏘️ Municipios analizados", datos_resumen["total_municipios"])
+        st.metric("📅 Años cubiertos", f"{datos_resumen['año_inicio']} - {datos_resumen['año_fin']} ({datos_resumen['años_analizados']} años)")
 
     with col2:
-        st.metric("📈 Municipio con más casos", f"{municipio_max['NombreMunicipio']} ({int(municipio_max['NumeroCasos'])} casos)")
-        st.metric("📉 Municipio con menos casos", f"{municipio_min['NombreMunicipio']} ({int(municipio_min['NumeroCasos'])} casos)")
-        st.metric("📊 Promedio por municipio", f"{promedio_municipio:.2f} casos")
+        st.metric("📈 Municipio con más casos", f"{municipio_max} ({casos_max} casos)")
+        st.metric("📉 Municipio con menos casos", f"{municipio_min} ({casos_min} casos)")
+        st.metric("📊 Promedio por municipio", f"{datos_resumen['promedio_municipio']:.2f} casos")
 
     # Variación media si hay solo un municipio
     municipios_unicos = df_interanual["NombreMunicipio"].nunique()
@@ -5,12 +5,13 @@ from io import BytesIO
 import base64
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
+from consultas import cargar_datos, filtrar, comparar_con_promedio, resumen
 
 st.title("📊 Análisis Visual y Exportación de Datos")
 
 @st.cache_data
 def load_data():
-    return pd.read_excel("static/datasets/Cantidad_anual_de_suicidios_reportados.xls")
+    return cargar_datos()
 
 df = load_data()
 
@@ -23,21 +24,15 @@ año_seleccionado = st.sidebar.selectbox("Selecciona un año para comparar", añ
 # Filtro 1: Municipios con casos acumulados mayores a un mínimo
 df_acumulado = df.groupby("NombreMunicipio", as_index=False)["NumeroCasos"].sum()
 min_casos = st.sidebar.slider("Mostrar municipios con al menos N casos en total", 0, int(df_acumulado["NumeroCasos"].max()), 10)
-municipios_validos = df_acumulado[df_acumulado["NumeroCasos"] >= min_casos]["NombreMunicipio"]
-df_filtrado = df[df["NombreMunicipio"].isin(municipios_validos)]
 
 # Filtro 2: Comparar con promedio general
-promedio_general = df.groupby("NombreMunicipio")["NumeroCasos"].mean().reset_index()
-promedio_general.columns = ["NombreMunicipio", "PromedioGeneral"]
-df_ultimo = df[df["Año"] == año_seleccionado]
-df_comparado = df_ultimo.merge(promedio_general, on="NombreMunicipio")
-df_comparado["Diferencia"] = df_comparado["NumeroCasos"] - df_comparado["PromedioGeneral"]
+df_comparado = comparar_con_promedio(df, año_seleccionado)
 
 comparacion = st.sidebar.radio("Comparar el año seleccionado con el promedio general", ["Todos", "Mayor al promedio", "Menor al promedio"])
-if comparacion != "Todos":
-    cond = df_comparado["Diferencia"] > 0 if comparacion == "Mayor al promedio" else df_comparado["Diferencia"] < 0
-    municipios_comparados = df_comparado[cond]["NombreMunicipio"]
-    df_filtrado = df_filtrado[df_filtrado["NombreMunicipio"].isin(municipios_comparados)]
+comparar_promedio = {"Mayor al promedio": "mayor", "Menor al promedio": "menor"}.get(comparacion)
+
+df_filtrado = filtrar(df, min_casos_acumulados=min_casos, comparar_promedio=comparar_promedio,
+                      año_comparacion=año_seleccionado)
 
 # ======= Gráficos =======
 st.subheader("📈 Evolución anual por municipio")
@@ -111,26 +106,20 @@ def to_pdf(df):
     text.setFont("Helvetica", 10)
     text.textLine("")
 
-    if df.empty:
+    datos_resumen = resumen(df)
+    if datos_resumen is None:
         text.textLine("No hay datos disponibles para los filtros aplicados.")
     else:
         # Estadísticas clave
-        total_casos = df["NumeroCasos"].sum()
-        total_municipios = df["NombreMunicipio"].nunique()
-        año_inicio = df["Año"].min()
-        año_fin = df["Año"].max()
-
-        resumen_agrupado = df.groupby("NombreMunicipio")["NumeroCasos"].sum().reset_index()
-        municipio_max = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmax()]
-        municipio_min = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmin()]
-        mediana = resumen_agrupado["NumeroCasos"].median()
-
-        text.textLine(f"🔢 Total de casos reportados: {int(total_casos):,}")
-        text.textLine(f"🏘️ Municipios analizados: {total_municipios}")
-        text.textLine(f"📅 Rango de años: {año_inicio} - {año_fin}")
-        text.textLine(f"📈 Municipio con más casos: {municipio_max['NombreMunicipio']} ({int(municipio_max['NumeroCasos'])})")
-        text.textLine(f"📉 Municipio con menos casos: {municipio_min['NombreMunicipio']} ({int(municipio_min['NumeroCasos'])})")
-        text.textLine(f"📊 Mediana de casos por municipio: {mediana:.2f}")
+        municipio_max, casos_max = datos_resumen["municipio_max"]
+        municipio_min, casos_min = datos_resumen["municipio_min"]
+
+        text.textLine(f"🔢 Total de casos reportados: {datos_resumen['total_casos']:,}")
+        text.textLine(f"🏘️ Municipios analizados: {datos_resumen['total_municipios']}")
+        text.textLine(f"📅 Rango de años: {datos_resumen['año_inicio']} - {datos_resumen['año_fin']}")
+        text.textLine(f"📈 Municipio con más casos: {municipio_max} ({casos_max})")
+        text.textLine(f"📉 Municipio con menos casos: {municipio_min} ({casos_min})")
+        text.textLine(f"📊 Mediana de casos por municipio: {datos_resumen['mediana_municipio']:.2f}")
         text.textLine("")
 
         # Tabla básica de datos
@@ -167,25 +156,19 @@ st.subheader("🧾 Resumen de Datos Filtrados")
 if df_filtrado.empty:
     st.info("No hay datos disponibles para mostrar un resumen con los filtros aplicados.")
 else:
-    total_casos = df_filtrado["NumeroCasos"].sum()
-    total_municipios = df_filtrado["NombreMunicipio"].nunique()
-    año_inicio = df_filtrado["Año"].min()
-    año_fin = df_filtrado["Año"].max()
-
-    resumen_agrupado = df_filtrado.groupby("NombreMunicipio")["NumeroCasos"].sum().reset_index()
-    municipio_max = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmax()]
-    municipio_min = resumen_agrupado.loc[resumen_agrupado["NumeroCasos"].idxmin()]
-    promedio_municipio = resumen_agrupado["NumeroCasos"].mean()
+    datos_resumen = resumen(df_filtrado)
+    municipio_max, casos_max = datos_resumen["municipio_max"]
+    municipio_min, casos_min = datos_resumen["municipio_min"]
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.metric("🔢 Total de casos reportados", f"{int(total_casos):,}")
-        st.metric("🏘️ Municipios analizados", total_municipios)
-        st.metric("📅 Rango de años", f"{año_inicio} - {año_fin}")
+        st.metric("🔢 Total de casos reportados", f"{datos_resumen['total_casos']:,}")
+        st.metric("🏘️ Municipios analizados", datos_resumen["total_municipios"])
+        st.metric("📅 Rango de años", f"{datos_resumen['año_inicio']} - {datos_resumen['año_fin']}")
 
     with col2:
-        st.metric("📈 Municipio con más casos", f"{municipio_max['NombreMunicipio']} ({int(municipio_max['NumeroCasos'])})")
-        st.metric("📉 Municipio con menos casos", f"{municipio_min['NombreMunicipio']} ({int(municipio_min['NumeroCasos'])})")
-        st.metric("📊 Mediana de casos por municipio", f"{resumen_agrupado['NumeroCasos'].median():.2f} casos")
+        st.metric("📈 Municipio con más casos", f"{municipio_max} ({casos_max})")
+        st.metric("📉 Municipio con menos casos", f"{municipio_min} ({casos_min})")
+        st.metric("📊 Mediana de casos por municipio", f"{datos_resumen['mediana_municipio']:.2f} casos")
 
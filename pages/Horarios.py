@@ -1,6 +1,11 @@
 import streamlit as st
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pa_json
+import re
+import shutil
+from io import BytesIO
 from datetime import datetime
 
 # Configuración de la página
@@ -16,16 +21,82 @@ API_ENDPOINTS = {
 
 }
 
-@st.cache_data(ttl=300)  # Cache de 5 minutos
-def cargar_datos(tipo):
+# Tipos de las columnas que usa la página, por endpoint. Los ids usan el mismo tipo en
+# todos los endpoints para que los merge entre tablas no dependan de la inferencia.
+# Los campos que no aparecen aquí se cargan igual, con el tipo inferido.
+ESQUEMAS = {
+    "estudiantes": pa.schema([
+        ("nombre", pa.string()),
+        ("email", pa.string()),
+        ("carrera", pa.string()),
+        ("semestre", pa.int64()),
+        ("clases", pa.list_(pa.int64())),
+        ("fecha", pa.string()),
+    ]),
+    "clases": pa.schema([
+        ("id_clase", pa.int64()),
+        ("nombre_clase", pa.string()),
+        ("horario", pa.string()),
+        ("aula", pa.string()),
+        ("id_profesor", pa.int64()),
+        ("fecha", pa.string()),
+    ]),
+    "profesores": pa.schema([
+        ("id_profesor", pa.int64()),
+        ("nombre", pa.string()),
+        ("nombre_profesor", pa.string()),
+        ("departamento", pa.string()),
+        ("especialidad", pa.string()),
+        ("email", pa.string()),
+        ("fecha", pa.string()),
+    ]),
+    "horarios": pa.schema([]),
+}
+
+def decodificar_columnas(flujo, tipo):
+    """Lee la respuesta JSON de `flujo` a columnas Arrow con el esquema del endpoint.
+
+    La lista de registros se envuelve como `{"datos": [...]}` para que `pyarrow.json`
+    la lea como una sola fila, sin crear un diccionario de Python por registro. Por eso
+    la respuesta completa se copia una vez a memoria (no se procesa por partes): una fila
+    no puede repartirse entre bloques. Un valor que no cumple el tipo declarado lanza
+    `pa.ArrowInvalid`; las columnas declaradas que llegan vacías se descartan.
+    """
+    esquema = ESQUEMAS[tipo]
+    buffer = BytesIO()
+    buffer.write(b'{"datos":')
+    shutil.copyfileobj(flujo, buffer)
+    buffer.write(b'}')
+    contenido = buffer.getbuffer()
+    tabla = pa_json.read_json(
+        pa.BufferReader(pa.py_buffer(contenido)),
+        read_options=pa_json.ReadOptions(block_size=len(contenido) + 1),
+        parse_options=pa_json.ParseOptions(
+            explicit_schema=pa.schema([("datos", pa.list_(pa.struct(esquema)))]),
+            unexpected_field_behavior="infer",
+            newlines_in_values=re.search(b"\n", contenido) is not None,
+        ),
+    )
+    tabla = pa.Table.from_struct_array(tabla.column("datos").combine_chunks().flatten())
+    ausentes = [nombre for nombre in esquema.names if tabla.column(nombre).null_count == tabla.num_rows]
+    return tabla.drop_columns(ausentes)
+
+@st.cache_resource(ttl=300)  # Compartido entre sesiones, 5 minutos; no modificar el DataFrame
+def snapshot_columnar(tipo):
     try:
-        response = requests.get(API_ENDPOINTS[tipo], timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return pd.DataFrame(data)
+        with requests.get(API_ENDPOINTS[tipo], timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            tabla = decodificar_columnas(response.raw, tipo)
+        return tabla.to_pandas(self_destruct=True), None
     except Exception as e:
-        st.error(f"Error al cargar {tipo}: {str(e)}")
-        return pd.DataFrame()
+        return pd.DataFrame(), str(e)
+
+def cargar_datos(tipo, mostrar_error=True):
+    df, error = snapshot_columnar(tipo)
+    if error and mostrar_error:
+        st.error(f"Error al cargar {tipo}: {error}")
+    return df
     
     # Mostrar el código de la función cargar_datos si el usuario lo desea
 with st.expander("📄 Ver código de la función cargar_datos", expanded=False):
@@ -34,16 +105,22 @@ with st.expander("📄 Ver código de la función cargar_datos", expanded=False)
 import requests
 import pandas as pd
 from datetime import datetime
-@st.cache_data(ttl=300)  # Cache de 5 minutos
-def cargar_datos(tipo):
+@st.cache_resource(ttl=300)  # Compartido entre sesiones, 5 minutos; no modificar el DataFrame
+def snapshot_columnar(tipo):
     try:
-        response = requests.get(API_ENDPOINTS[tipo], timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return pd.DataFrame(data)
+        with requests.get(API_ENDPOINTS[tipo], timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            tabla = decodificar_columnas(response.raw, tipo)
+        return tabla.to_pandas(self_destruct=True), None
     except Exception as e:
-        st.error(f"Error al cargar {tipo}: {str(e)}")
-        return pd.DataFrame()''', language='python')
+        return pd.DataFrame(), str(e)
+
+def cargar_datos(tipo, mostrar_error=True):
+    df, error = snapshot_columnar(tipo)
+    if error and mostrar_error:
+        st.error(f"Error al cargar {tipo}: {error}")
+    return df''', language='python')
 
 
 # Cargar todos los datos
@@ -51,7 +128,7 @@ with st.spinner("Cargando datos académicos..."):
     estudiantes_df = cargar_datos("estudiantes")
     clases_df = cargar_datos("clases")
     profesores_df = cargar_datos("profesores")
-    horarios_df = cargar_datos("horarios")
+    horarios_df = cargar_datos("horarios", mostrar_error=False)  # No se muestra en la página
 
 # Sidebar con selección de tabla principal
 st.sidebar.header("🔍 Filtros Principales")
@@ -175,6 +252,7 @@ elif tabla_seleccionada == "Profesores":
 # Actualización manual de datos
 if st.sidebar.button("🔄 Actualizar Todos los Datos"):
     st.cache_data.clear()
+    st.cache_resource.clear()
     st.rerun()
 
 st.sidebar.markdown(f"Última actualización: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file